@@ -1,6 +1,199 @@
-import os, redis
+import os, redis, json, time, uuid, logging, threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
 # Constructs Redis connection URL from the REDIS_URL environment variable
 # falling back to a local Redis instance if not set.
 redis_client = redis.from_url(
     os.getenv("REDIS_URL", "redis://localhost:6379/0"),
 )
+
+# per-worker memory tier limits, the ttl cap bounds how stale a worker can be
+# if it ever misses an invalidation message
+LOCAL_CACHE_MAX_BYTES = int(os.getenv("LOCAL_CACHE_MAX_BYTES", 8 * 1024 * 1024))
+LOCAL_CACHE_MAX_TTL = float(os.getenv("LOCAL_CACHE_MAX_TTL", 5))
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+
+class CacheStats:
+    """
+    hit/miss counters for a single cache tier
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def as_dict(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+
+class LocalCache:
+    """
+    thread safe in-process LRU with per entry TTL.
+    evicts least recently used entries once the stored values
+    exceed max_bytes.
+    """
+
+    def __init__(self, max_bytes=LOCAL_CACHE_MAX_BYTES, max_ttl=LOCAL_CACHE_MAX_TTL):
+        self.max_bytes = max_bytes
+        self.max_ttl = max_ttl
+        self.size = 0
+        self.stats = CacheStats()
+        self._entries = OrderedDict() # key -> (value, expires_at)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._pop(key)
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def set(self, key, value, ttl):
+        ttl = min(ttl, self.max_ttl)
+        if ttl <= 0 or len(value) > self.max_bytes:
+            self.delete(key)
+            return
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self.size += len(value)
+            while self.size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._pop(oldest)
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _pop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[0])
+
+
+class TieredCache:
+    """
+    two tier cache: per-worker LocalCache in front of Redis.
+    writes and deletes go to Redis and are broadcast over pub/sub so the
+    other workers drop their local copy of the key.
+    """
+
+    def __init__(self, client, local=None, channel=INVALIDATION_CHANNEL):
+        self.redis = client
+        self.local = local or LocalCache()
+        self.channel = channel
+        self.stats = CacheStats()
+        self._origin = uuid.uuid4().hex # lets a worker ignore its own broadcasts
+        self._pubsub = None
+        self._listener = None
+
+    def get(self, key):
+        """
+        returns cached bytes for key or None.
+        a local hit skips Redis entirely; a Redis hit is copied into the
+        local tier for the rest of its Redis TTL (capped by max_ttl).
+        """
+        value = self.local.get(key)
+        if value is not None:
+            return value
+
+        # fetch value and remaining ttl in a single round trip
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.get(key)
+        pipe.pttl(key)
+        value, pttl = pipe.execute()
+
+        if value is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        # pttl is -1 when the key has no expiry
+        ttl = self.local.max_ttl if pttl < 0 else pttl / 1000
+        self.local.set(key, value, ttl)
+        return value
+
+    def setex(self, key, ttl, value):
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        self.redis.setex(key, ttl, value)
+        self.local.set(key, value, ttl)
+        self._publish(key)
+
+    def delete(self, *keys):
+        self.redis.delete(*keys)
+        self.local.delete(*keys)
+        self._publish(*keys)
+
+    def get_stats(self):
+        return {
+            "local": {**self.local.stats.as_dict(), "bytes": self.local.size},
+            "redis": self.stats.as_dict(),
+        }
+
+    def start_listener(self):
+        """
+        subscribes to the invalidation channel on a background thread
+        """
+        if self._listener is not None:
+            return
+        self._pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(**{self.channel: self._handle_message})
+        self._listener = self._pubsub.run_in_thread(
+            sleep_time=1.0,
+            daemon=True,
+            exception_handler=self._handle_listener_error,
+        )
+
+    def stop_listener(self):
+        if self._listener is None:
+            return
+        self._listener.stop()
+        self._listener.join(timeout=2)
+        self._pubsub.close()
+        self._listener = None
+        self._pubsub = None
+
+    def _publish(self, *keys):
+        message = json.dumps({"origin": self._origin, "keys": list(keys)})
+        self.redis.publish(self.channel, message)
+
+    def _handle_message(self, message):
+        try:
+            payload = json.loads(message["data"])
+        except (TypeError, ValueError):
+            return
+        if payload.get("origin") == self._origin:
+            return
+        self.local.delete(*payload.get("keys", []))
+
+    def _handle_listener_error(self, e, pubsub, worker):
+        # invalidations may have been missed while disconnected,
+        # so drop the whole local tier and let the client reconnect
+        logger.warning("cache invalidation listener error: %s", e)
+        self.local.clear()
+        time.sleep(1)
+
+
+cache = TieredCache(redis_client)
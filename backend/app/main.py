@@ -9,24 +9,25 @@ import json
 import asyncio
 
 import httpx
-import redis
 
 # now import your modules _inside_ the app package:
 from . import models, database
 from .scheduler import scheduler
 from .routers.station import router as station_router
-from .clients import redis_client
+from .clients import cache
 from . import database
 
 #track request, and check if favorite can be tracked
 load_dotenv()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    cache.start_listener()
     await sync_stop_table()
     scheduler.add_job(sync_stop_table, trigger="cron", day=1, hour=0, minute=0, misfire_grace_time=3600, coalesce=True, id="monthly_stop_sync")
     scheduler.start()
     yield
     scheduler.shutdown()
+    cache.stop_listener()
 
 app = FastAPI(lifespan=lifespan, debug=True)
 TRIMET_APP_ID=os.getenv("TRIMET_APP_ID")
@@ -36,8 +37,6 @@ if not TRIMET_APP_ID:
 client = httpx.AsyncClient()
 #database.Base.metadata.drop_all(bind=database.engine)
 database.Base.metadata.create_all(bind=database.engine)
-REDIS_URL=os.getenv("REDIS_URL")
-redis_client = redis.from_url(REDIS_URL)
 
 # sample default coordinates
 longitude= -122.6765
@@ -63,12 +62,12 @@ async def root():
 @app.get("/arrivals/{stop_id}")
 async def get_arrivals(stop_id: int):
     """
-    fetches arrival data from Trimet API or Redis cache,
+    fetches arrival data from Trimet API or the two tier cache,
     filters for estimated/scheduled status, caches results for 60s
     """
     url = f"https://developer.trimet.org/ws/v2/arrivals?locIDs={stop_id}&showPosition=true&appID={TRIMET_APP_ID}&minutes=60"
     cache_key = f"stop:{stop_id}:arrivals"
-    cached_data = redis_client.get(cache_key)
+    cached_data = cache.get(cache_key)
     
     if cached_data:
         data_json = cached_data.decode('utf-8')
@@ -99,7 +98,7 @@ async def get_arrivals(stop_id: int):
             )
             arrivals_db[str(new_route.route_id) + ":" + str(eta)] = new_route.model_dump()
     
-    redis_client.setex(cache_key, 60, json.dumps(arrivals_db))    
+    cache.setex(cache_key, 60, json.dumps(arrivals_db))    
     return arrivals_db # -> {k:v.dict() for k, v in arrivals_db.items()}
 
 @app.get("/stops")
@@ -203,6 +202,8 @@ async def sync_stop_table():
     stops = await fetch_stops()
     # run the blocking DB sync on a thread
     await anyio.to_thread.run_sync(_sync_stops, stops)
+    # stop table changed, drop the cached station list on every worker
+    cache.delete("stations")
 
 def _sync_stops(stops):
     """
@@ -254,6 +255,14 @@ async def sync_stops():
         return {"message": "Stops successfully synced"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/cache/stats", tags=["admin"])
+async def cache_stats():
+    """
+    returns hit/miss counts and hit ratio for the local and Redis cache tiers
+    of the worker that served the request
+    """
+    return cache.get_stats()
     
 @app.websocket("/track/{stop_id}/{route_id}")
 async def track(ws: WebSocket, stop_id: int, route_id: int):
@@ -2,16 +2,19 @@ from fastapi import APIRouter, HTTPException, Depends, Request, Query
 from sqlalchemy.orm import Session
 from typing import List
 import os
+import json
 
 from ..database import SessionLocal, Stop as StationModel
 from ..models import Station
 from ..utils.overpass import parse_overpass
-from ..clients import redis_client
+from ..clients import cache
 from ..database import Stop
 
 router = APIRouter()
 # Trimet API credentials, if used for external data sources
 TRIMET_APP_ID = os.getenv("TRIMET_APP_ID")
+# station list only changes through sync/CRUD, which invalidate it explicitly
+STATIONS_CACHE_TTL = 3600
 
 # Dependency to get a DB session
 def get_db():
@@ -23,12 +26,17 @@ def get_db():
 
 """
 Lists all stations in the database.
+Served from the cache when possible.
 Returns a list of Station Pydantic models.
 """
 @router.get("/stations", response_model=List[Station])
 async def list_stations(db: Session = Depends(get_db)):
+    cached_data = cache.get("stations")
+    if cached_data:
+        return json.loads(cached_data.decode("utf-8"))
+
     db_stops = db.query(StationModel).all()
-    return [
+    stations = [
         Station(
             stop_id=s.id,
             name=s.name,
@@ -36,9 +44,11 @@ async def list_stations(db: Session = Depends(get_db)):
             lon=s.longitude,
             lat=s.latitude,
             dist=0
-        )
+        ).model_dump()
         for s in db_stops
     ]
+    cache.setex("stations", STATIONS_CACHE_TTL, json.dumps(stations))
+    return stations
 
 
 """
@@ -63,6 +73,7 @@ async def create_station(station: Station, db: Session = Depends(get_db)):
     db.add(new)
     db.commit()
     db.refresh(new)
+    cache.delete("stations")
     return Station(
         stop_id=new.id,
         name=new.name,
@@ -82,6 +93,7 @@ async def update_station(stop_id: int, station: Station, db: Session = Depends(g
     s.name = station.name
     db.commit()
     db.refresh(s)
+    cache.delete("stations")
     return Station(
         stop_id=s.id,
         name=s.name,
@@ -100,17 +112,18 @@ async def delete_station(stop_id: int, db: Session = Depends(get_db)):
         raise HTTPException(404, "Station not found")
     db.delete(s)
     db.commit()
+    cache.delete("stations")
     return {"message": "Station deleted"}
 
 
 
 """
 Admin endpoint to bulk import stations from the Overpass API.
-- Clears Redis cache for stations.
 - Validates the bounding box parameter.
 - Wipes existing station data.
 - Fetches fresh station data from Overpass.
 - Inserts the new stations.
+- Clears the cached station list on every worker after each write.
 """
 @router.post("/stations/import", tags=["admin"])
 async def import_stations(
@@ -118,9 +131,6 @@ async def import_stations(
     bbox: str = Query(..., description="min_lon,min_lat,max_lon,max_lat"),
     db: Session = Depends(get_db),
 ):
-    # clear cache
-    redis_client.delete("stations")
-
     # validate bbox
     try:
         coords = [float(x) for x in bbox.split(",")]
@@ -132,6 +142,7 @@ async def import_stations(
     # wipe old data
     db.query(StationModel).delete()
     db.commit()
+    cache.delete("stations")
 
     # fetch fresh from Overpass
     try:
@@ -143,6 +154,7 @@ async def import_stations(
     for s in stations:
         db.add(StationModel(**s))
     db.commit()
+    cache.delete("stations")
 
     return {"imported": len(stations)}
 